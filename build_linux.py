@@ -5,12 +5,16 @@ Linux build helper for PDF Toolkit GUI
 - Reuses versioning from build.py (build/VERSION and version.py generation)
 - Runs PyInstaller using the Linux spec (PDF-Toolkit-GUI-linux.spec)
 - Produces the binary in dist/linux
-- Optionally packages a tar.gz bundle for distribution with a .desktop file
+- Optionally packages a tarball bundle for distribution with a .desktop file
+  (tar.zst when the optional 'zstandard' package is installed, tar.gz otherwise)
 
 Usage (from project root):
   python build_linux.py                 # bump version (minor), build, create tarball
   python build_linux.py --no-increment  # do not bump version
   python build_linux.py --clean         # remove dist/linux and build/pyi-linux before building
+                                        # (only needed after dependency/spec changes; normal runs
+                                        # reuse PyInstaller's analysis cache in build/pyi-linux,
+                                        # which makes iterative rebuilds much faster)
   python build_linux.py --no-tarball    # skip tarball packaging
   python build_linux.py --bump-major    # bump major (resets minor)
   python build_linux.py --bump-minor    # bump minor
@@ -18,10 +22,11 @@ Usage (from project root):
 Notes:
 - Requires: PyInstaller installed in the current environment
 - Output: dist/linux/PDF-Toolkit-GUI-<MAJOR>.<MINOR>-linux
-- Tarball: dist/PDF-Toolkit-GUI-<MAJOR>.<MINOR>-linux-<arch>.tar.gz
+- Tarball: dist/PDF-Toolkit-GUI-<MAJOR>.<MINOR>-linux-<arch>.tar.zst (or .tar.gz)
 """
 from __future__ import annotations
 import argparse
+import hashlib
 import os
 import platform
 import shutil
@@ -29,6 +34,7 @@ import stat
 import subprocess
 import sys
 import tarfile
+import tempfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
@@ -46,6 +52,15 @@ except Exception:
     winbuild = None
 
 
+def _write_if_changed(path: Path, content: str) -> None:
+    try:
+        if path.exists() and path.read_text(encoding='utf-8') == content:
+            return
+    except OSError:
+        pass
+    path.write_text(content, encoding='utf-8')
+
+
 def ensure_version(bump_major: bool, bump_minor: bool, no_increment: bool) -> str:
     """Read/bump version using build.py helpers and generate version.py.
     Returns textual version MAJOR.MINOR.
@@ -70,13 +85,13 @@ def ensure_version(bump_major: bool, bump_minor: bool, no_increment: bool) -> st
             nums[1] += 1
         elif not no_increment:
             nums[1] += 1
-        vf.write_text(f"{nums[0]}.{nums[1]}", encoding='utf-8')
+        # Only touch files whose content actually changed (e.g. --no-increment
+        # reruns) so repeated invocations don't churn mtimes for nothing.
+        ver = f"{nums[0]}.{nums[1]}"
+        _write_if_changed(vf, ver)
         # write version.py (GUI reads __version__)
-        (ROOT / 'version.py').write_text(
-            f"# Auto-generated\n__version__ = '{nums[0]}.{nums[1]}'\n",
-            encoding='utf-8'
-        )
-        return f"{nums[0]}.{nums[1]}"
+        _write_if_changed(ROOT / 'version.py', f"# Auto-generated\n__version__ = '{ver}'\n")
+        return ver
 
     # Use shared helper from build.py
     nums = winbuild.read_version()
@@ -102,7 +117,28 @@ def ensure_version(bump_major: bool, bump_minor: bool, no_increment: bool) -> st
     return '.'.join(str(n) for n in nums)
 
 
+def compute_build_key(spec_path: str) -> str:
+    """Hash everything that feeds the PyInstaller build: project sources,
+    the spec file and requirements.txt. If none of these changed since the
+    last successful build, re-running PyInstaller would reproduce the same
+    binary, so main() can skip it entirely.
+    """
+    h = hashlib.sha256()
+    sources = sorted(
+        p for p in ROOT.rglob('*.py')
+        if not any(part in ('build', 'dist', '.git', '__pycache__') for part in p.relative_to(ROOT).parts)
+    )
+    extras = [Path(spec_path), ROOT / 'requirements.txt']
+    for p in sources + [e for e in extras if e.exists()]:
+        h.update(p.name.encode('utf-8'))
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
 def run_pyinstaller(spec_path: str) -> None:
+    # Deliberately no --clean and a stable --workpath: PyInstaller caches its
+    # analysis under build/pyi-linux, so repeated builds skip the full
+    # re-analysis unless the user wipes it with our --clean flag.
     cmd = [sys.executable, '-m', 'PyInstaller', '--distpath', str(LINUX_DIST), '--workpath', str(WORK_DIR), spec_path]
     print('Running:', ' '.join(cmd))
     env = os.environ.copy()
@@ -127,18 +163,23 @@ def find_built_binary(dist_dir: Path) -> Path | None:
     """
     if not dist_dir.exists():
         return None
+    # os.scandir serves type and stat info from the readdir batch, so this
+    # is one pass with no extra stat() syscall per entry.
     candidates = []
-    for p in dist_dir.iterdir():
-        if not p.is_file():
-            continue
-        try:
-            st = p.stat()
+    files = []
+    with os.scandir(dist_dir) as it:
+        for e in it:
+            try:
+                if not e.is_file():
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            entry = (st.st_mtime, Path(e.path))
+            files.append(entry)
             if st.st_mode & stat.S_IXUSR:
-                candidates.append((st.st_mtime, p))
-        except OSError:
-            continue
+                candidates.append(entry)
     if not candidates:
-        files = [(p.stat().st_mtime, p) for p in dist_dir.iterdir() if p.is_file()]
         if not files:
             return None
         candidates = files
@@ -151,37 +192,82 @@ def write_desktop_file(target_bin_name: str, out_path: Path) -> None:
     out_path.write_text(desktop, encoding='utf-8')
 
 
-def make_tarball(binary_path: Path, version: str, arch: str) -> Path:
-    staging_root = BUILD_DIR / 'linux_pkg'
-    if staging_root.exists():
-        shutil.rmtree(staging_root, ignore_errors=True)
-    staging_root.mkdir(parents=True, exist_ok=True)
-
-    top_dir = staging_root / f'PDF-Toolkit-GUI-{version}-linux-{arch}'
-    top_dir.mkdir(parents=True, exist_ok=True)
-
-    # Place binary with a user-friendly name inside the tarball
-    bin_dst = top_dir / 'PDF-Toolkit-GUI'
-    shutil.copy2(binary_path, bin_dst)
+def make_tarball(binary_path: Path, version: str, arch: str, compresslevel: int = 6) -> Path:
+    DIST_DIR.mkdir(exist_ok=True)
+    tar_base = f'PDF-Toolkit-GUI-{version}-linux-{arch}'
+    top = tar_base  # top-level directory name inside the tarball
+
+    # Write the desktop entry to a throwaway temp file; everything else is
+    # added straight from its source location with an explicit arcname, so
+    # the (possibly 100MB+) binary is read exactly once instead of being
+    # copied into a staging dir first.
+    fd, desktop_name = tempfile.mkstemp(suffix='.desktop')
+    os.close(fd)
+    desktop_tmp = Path(desktop_name)
+    write_desktop_file(target_bin_name='./PDF-Toolkit-GUI', out_path=desktop_tmp)
+
+    def _make_exec(ti: tarfile.TarInfo) -> tarfile.TarInfo:
+        ti.mode |= stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+        return ti
+
+    def _make_regular(ti: tarfile.TarInfo) -> tarfile.TarInfo:
+        # mkstemp creates files 0600; ship the desktop entry world-readable
+        ti.mode = 0o644
+        return ti
+
+    def _add_members(tf: tarfile.TarFile) -> None:
+        # Place binary with a user-friendly name inside the tarball
+        tf.add(binary_path, arcname=f'{top}/PDF-Toolkit-GUI', filter=_make_exec)
+        tf.add(desktop_tmp, arcname=f'{top}/pdf-toolkit-gui.desktop', filter=_make_regular)
+        # Include README and LICENSE if present
+        for fname in ('README.md', 'LICENSE'):
+            src = ROOT / fname
+            if src.exists():
+                tf.add(src, arcname=f'{top}/{fname}')
+
+    # Prefer zstd when the optional 'zstandard' package is installed: level 15
+    # reaches ~90-95% of gzip-9's ratio at a fraction of the CPU, parallelized
+    # across cores, and decompresses much faster for downloaders.
     try:
-        bin_dst.chmod(bin_dst.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-    except Exception:
-        pass
-
-    # Add desktop entry
-    desktop_path = top_dir / 'pdf-toolkit-gui.desktop'
-    write_desktop_file(target_bin_name='./PDF-Toolkit-GUI', out_path=desktop_path)
+        import zstandard
+    except ImportError:
+        zstandard = None
 
-    # Include README and LICENSE if present
-    for fname in ('README.md', 'LICENSE'):
-        src = ROOT / fname
-        if src.exists():
-            shutil.copy2(src, top_dir / fname)
-
-    tar_out = DIST_DIR / f'PDF-Toolkit-GUI-{version}-linux-{arch}.tar.gz'
-    DIST_DIR.mkdir(exist_ok=True)
-    with tarfile.open(tar_out, 'w:gz') as tf:
-        tf.add(top_dir, arcname=top_dir.name)
+    try:
+        if zstandard is not None:
+            tar_out = DIST_DIR / f'{tar_base}.tar.zst'
+            cctx = zstandard.ZstdCompressor(level=15, threads=-1)
+            with open(tar_out, 'wb') as raw:
+                with cctx.stream_writer(raw) as zf:
+                    with tarfile.open(mode='w|', fileobj=zf) as tf:
+                        _add_members(tf)
+        else:
+            # Fallback: gzip. Level 6 is near-identical in size to the default 9
+            # for an already-compressed PyInstaller binary, but takes a fraction
+            # of the CPU time. Prefer pigz when installed: it produces a
+            # gzip-compatible stream but compresses on all cores, while stdlib
+            # gzip is single-threaded.
+            tar_out = DIST_DIR / f'{tar_base}.tar.gz'
+            pigz = shutil.which('pigz')
+            if pigz:
+                with open(tar_out, 'wb') as raw:
+                    proc = subprocess.Popen(
+                        [pigz, f'-{compresslevel}', '-p', str(os.cpu_count() or 1)],
+                        stdin=subprocess.PIPE, stdout=raw,
+                    )
+                    try:
+                        with tarfile.open(mode='w|', fileobj=proc.stdin) as tf:
+                            _add_members(tf)
+                    finally:
+                        proc.stdin.close()
+                        ret = proc.wait()
+                if ret != 0:
+                    raise RuntimeError(f'pigz exited with status {ret}')
+            else:
+                with tarfile.open(tar_out, 'w:gz', compresslevel=compresslevel) as tf:
+                    _add_members(tf)
+    finally:
+        desktop_tmp.unlink(missing_ok=True)
     print('Created tarball', tar_out)
     return tar_out
 
@@ -192,25 +278,39 @@ def main(argv: list[str]) -> int:
     ap.add_argument('--no-increment', action='store_true', help="Don't bump version (use current build/VERSION)")
     ap.add_argument('--bump-major', action='store_true', help='Bump MAJOR (resets MINOR)')
     ap.add_argument('--bump-minor', action='store_true', help='Bump MINOR')
-    ap.add_argument('--clean', action='store_true', help='Remove dist/linux and build/pyi-linux before building')
+    ap.add_argument('--clean', action='store_true', help='Remove dist/linux and build/pyi-linux before building (forces full re-analysis; omit to reuse the cache)')
     ap.add_argument('--no-tarball', action='store_true', help='Skip creating the tar.gz bundle')
+    ap.add_argument('--compresslevel', type=int, default=6, help='gzip compression level for the tarball, 1-9 (default: 6)')
+    ap.add_argument('--force', action='store_true', help='Run PyInstaller even if build inputs are unchanged')
     args = ap.parse_args(argv)
 
     if args.clean:
-        for d in (LINUX_DIST, WORK_DIR, BUILD_DIR / 'linux_pkg'):
+        for d in (LINUX_DIST, WORK_DIR):
             if d.exists():
                 shutil.rmtree(d, ignore_errors=True)
                 print('Removed', d)
 
     version = ensure_version(bump_major=args.bump_major, bump_minor=args.bump_minor, no_increment=args.no_increment)
 
-    # Build
+    # Build — skipped when sources/spec/requirements are unchanged since the
+    # last successful build and its binary is still present.
     spec_path = str(ROOT / args.spec)
-    try:
-        run_pyinstaller(spec_path)
-    except subprocess.CalledProcessError as e:
-        print('PyInstaller failed with', e.returncode)
-        return e.returncode
+    build_key = compute_build_key(spec_path)
+    # Lives under the PyInstaller workdir (not dist/linux) so that
+    # find_built_binary never picks it up and --clean wipes it.
+    key_file = WORK_DIR / '.build_key'
+    if (not args.force and key_file.exists()
+            and key_file.read_text(encoding='utf-8').strip() == build_key
+            and find_built_binary(LINUX_DIST)):
+        print('Build inputs unchanged; reusing existing binary (use --force to rebuild)')
+    else:
+        try:
+            run_pyinstaller(spec_path)
+        except subprocess.CalledProcessError as e:
+            print('PyInstaller failed with', e.returncode)
+            return e.returncode
+        key_file.parent.mkdir(parents=True, exist_ok=True)
+        key_file.write_text(build_key, encoding='utf-8')
 
     # Locate built binary
     built = find_built_binary(LINUX_DIST)
@@ -223,7 +323,7 @@ def main(argv: list[str]) -> int:
     if not args.no_tarball:
         arch = detect_arch()
         try:
-            make_tarball(built, version=version, arch=arch)
+            make_tarball(built, version=version, arch=arch, compresslevel=args.compresslevel)
         except Exception as e:
             print('Warning: failed to create tarball:', e)
 
@@ -11,17 +11,22 @@ Install:
 from __future__ import annotations
 import os
 import argparse
+import mmap
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, List
 
 
 def merge_pdfs(
     inputs: Iterable[str],
     output: str,
+    max_compact: bool = False,
     progress_callback=None,
 ) -> str:
     """
     Merge input PDFs in the given order into 'output'. Returns the output path.
+    max_compact: run full object deduplication on save (slower; rarely smaller
+                 when the inputs are already-clean PDFs)
     progress_callback: optional callable taking (current_index: int, total: int)
     """
     import fitz  # delay import so --help works even if fitz has issues
@@ -41,22 +46,34 @@ def merge_pdfs(
     out_dir = os.path.dirname(os.path.abspath(output)) or os.getcwd()
     os.makedirs(out_dir, exist_ok=True)
 
+    def _open_source(path: str):
+        # mmap the input and hand PyMuPDF the buffer (as a memoryview — this
+        # PyMuPDF rejects mmap objects directly): the kernel serves only the
+        # byte ranges actually touched straight from the page cache, with no
+        # userspace read-ahead copy of the whole file.
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return fitz.open(stream=memoryview(mm), filetype='pdf'), mm
+
     out_doc = fitz.open()
     first_meta_set = False
+    total = len(in_paths)
+    # Open sources concurrently: PyMuPDF releases the GIL while parsing, so
+    # a thread pool overlaps file IO and parsing across documents. Insertion
+    # below still happens strictly in the given order.
+    with ThreadPoolExecutor(max_workers=min(8, total)) as pool:
+        opened = list(pool.map(_open_source, in_paths))
+    srcs = [doc for doc, _ in opened]
     try:
-        total = len(in_paths)
-        for i, path in enumerate(in_paths, 1):
-            src = fitz.open(path)
-            try:
-                if not first_meta_set:
-                    try:
-                        out_doc.set_metadata(src.metadata or {})
-                    except Exception:
-                        pass
-                    first_meta_set = True
-                out_doc.insert_pdf(src)
-            finally:
-                src.close()
+        for i, src in enumerate(srcs, 1):
+            if not first_meta_set:
+                try:
+                    out_doc.set_metadata(src.metadata or {})
+                except Exception:
+                    pass
+                first_meta_set = True
+            out_doc.insert_pdf(src)
+            src.close()
 
             if progress_callback:
                 try:
@@ -64,9 +81,24 @@ def merge_pdfs(
                 except Exception:
                     pass
 
-        out_doc.save(output, garbage=3, clean=True, deflate=True)
+        # garbage=1 drops unreferenced objects; the full dedup pass of
+        # garbage=3 is O(n) over the merged doc and buys little on clean
+        # inputs, so it is opt-in. Moderate deflate effort (~level 6):
+        # near-max ratio at about twice the speed, and source image streams
+        # are already compressed.
+        out_doc.save(output, garbage=3 if max_compact else 1, clean=True, deflate=True,
+                     deflate_images=False, compression_effort=60)
         return output
     finally:
+        for src, mm in opened:
+            if not src.is_closed:
+                src.close()
+            try:
+                mm.close()
+            except BufferError:
+                # the document object still holds a view; the mapping is
+                # released when it is garbage-collected
+                pass
         out_doc.close()
 
 
@@ -74,11 +106,12 @@ def main():
     ap = argparse.ArgumentParser(description="Merge multiple PDFs into one.")
     ap.add_argument("output", help="Output PDF path")
     ap.add_argument("inputs", nargs='+', help="Input PDF paths (2 or more)")
+    ap.add_argument("--max-compact", action="store_true", help="Full object deduplication on save (slower)")
     args = ap.parse_args()
 
     out_path = os.path.abspath(args.output)
     try:
-        result = merge_pdfs(args.inputs, out_path)
+        result = merge_pdfs(args.inputs, out_path, max_compact=args.max_compact)
         print(f"Created: {result}")
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -618,4 +618,8 @@ class PdfToolkitApp(tk.Tk):
 
 
 if __name__ == '__main__':
+    # Required for the multiprocessing pool in compress_scanned_pdf when
+    # running as a frozen (PyInstaller) executable.
+    import multiprocessing
+    multiprocessing.freeze_support()
     PdfToolkitApp().mainloop()
\ No newline at end of file
@@ -2,19 +2,49 @@
 """
 Shrink scanned PDFs by rasterizing each page and re-embedding as JPEG.
 Best for PDFs that are essentially one scanned photo per page.
-Requires: PyMuPDF and Pillow
+Requires: PyMuPDF, Pillow and NumPy
 
 Install:
-    pip install pymupdf pillow
+    pip install pymupdf pillow numpy
 """
 
 import os
 import sys
 import io
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
+import numpy as np
 from PIL import Image
 
+# Optional: libjpeg-turbo encoder via PyTurboJPEG. Its SIMD DCT/Huffman paths
+# are typically 2-4x faster than Pillow's generic libjpeg. Falls back to
+# Pillow when the package or the native library is missing.
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY, TJPF_RGB, TJSAMP_GRAY
+    _turbo = TurboJPEG()
+except Exception:
+    _turbo = None
+
+# Optional: Numba-compiled RGB->luma conversion. Rendering in RGB and
+# converting here (integer BT.601 weights, parallel over rows) beats MuPDF's
+# generic colorspace transform on multi-core machines. Falls back to letting
+# MuPDF render in grayscale directly when numba is missing.
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _rgb_to_gray(rgb, out):
+        for y in prange(rgb.shape[0]):
+            for x in range(rgb.shape[1]):
+                # Y = 0.299R + 0.587G + 0.114B in 8.8 fixed point
+                out[y, x] = (77 * rgb[y, x, 0] + 150 * rgb[y, x, 1] + 29 * rgb[y, x, 2]) >> 8
+
+    _have_numba = True
+except Exception:
+    _have_numba = False
+
 
 def human(n: float) -> str:
     for unit in ["B", "KB", "MB", "GB"]:
@@ -24,6 +54,81 @@ def human(n: float) -> str:
     return f"{n:.1f} TB"
 
 
+# Per-process cache of open documents. Workers each open their own handle
+# (PyMuPDF documents are not safe to share across processes) and keep it for
+# the lifetime of the pool instead of reopening per page.
+_worker_docs = {}
+
+
+def _effective_dpi(page, requested_dpi: int) -> int:
+    """Clamp the render DPI to the native resolution of the embedded scan.
+    Rendering a 120 DPI scan at 150 DPI just upsamples pixels and then
+    re-compresses them — more work for a bigger, blurrier JPEG. Only applies
+    when the page holds exactly one image (the scanned-page case).
+    """
+    imgs = page.get_images(full=True)
+    if len(imgs) != 1:
+        return requested_dpi
+    # get_images entries are (xref, smask, width, height, bpc, ...)
+    img_w, img_h = imgs[0][2], imgs[0][3]
+    rect = page.rect
+    if img_w <= 0 or img_h <= 0 or rect.width <= 0 or rect.height <= 0:
+        return requested_dpi
+    source_dpi = max(img_w / rect.width, img_h / rect.height) * 72.0
+    return min(requested_dpi, max(36, int(round(source_dpi))))
+
+
+def _render_page_jpeg(args):
+    """Worker: render one page at the given DPI and return
+    (page_width, page_height, jpeg_bytes). Runs in a separate process.
+    """
+    input_path, page_index, dpi, quality, grayscale, jpeg_optimize = args
+    doc = _worker_docs.get(input_path)
+    if doc is None:
+        doc = _worker_docs.setdefault(input_path, fitz.open(input_path))
+
+    page = doc.load_page(page_index)
+    rect = page.rect
+
+    zoom = _effective_dpi(page, dpi) / 72.0
+    mat = fitz.Matrix(zoom, zoom)
+    numba_gray = grayscale and _have_numba
+    cs = fitz.csGRAY if grayscale and not numba_gray else fitz.csRGB
+    pix = page.get_pixmap(matrix=mat, colorspace=cs, alpha=False)
+
+    # Wrap the pixmap samples in a NumPy view and encode. samples_mv is a
+    # true zero-copy memoryview into the pixmap buffer — the plain .samples
+    # property materializes a bytes copy (~4 MB per A4 page at 150 DPI RGB).
+    if numba_gray:
+        rgb = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+        arr = np.empty((pix.height, pix.width), dtype=np.uint8)
+        _rgb_to_gray(rgb, arr)
+    else:
+        shape = (pix.height, pix.width) if grayscale else (pix.height, pix.width, 3)
+        arr = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(shape)
+
+    if _turbo is not None:
+        if grayscale:
+            img_bytes = _turbo.encode(
+                arr.reshape(pix.height, pix.width, 1),
+                quality=quality,
+                pixel_format=TJPF_GRAY,
+                jpeg_subsample=TJSAMP_GRAY,
+            )
+        else:
+            img_bytes = _turbo.encode(arr, quality=quality, pixel_format=TJPF_RGB)
+    else:
+        img = Image.fromarray(arr)
+        buf = io.BytesIO()
+        # optimize=True adds a second Huffman pass: ~20-30% more CPU for a
+        # 1-3% smaller file. Off by default; --jpeg-optimize re-enables it.
+        img.save(buf, format="JPEG", quality=quality, optimize=jpeg_optimize, progressive=False)
+        img_bytes = buf.getvalue()
+        buf.close()
+
+    return rect.width, rect.height, img_bytes
+
+
 def compress_scanned_pdf(
     input_path: str,
     output_path: str,
@@ -32,6 +137,7 @@ def compress_scanned_pdf(
     grayscale: bool = False,
     optimize: bool = True,
     clean: bool = True,
+    jpeg_optimize: bool = False,
     progress_callback=None,
 ):
     """
@@ -49,40 +155,44 @@ def compress_scanned_pdf(
         except Exception:
             pass
 
-        zoom = dpi / 72.0
-        mat = fitz.Matrix(zoom, zoom)
-        cs = fitz.csGRAY if grayscale else fitz.csRGB
-
         total_pages = src.page_count
-        for i in range(1, total_pages + 1):
-            page = src.load_page(i - 1)
-            rect = page.rect
-            pix = page.get_pixmap(matrix=mat, colorspace=cs, alpha=False)
-
-            # Convert to PIL Image for JPEG compression
-            mode = "L" if grayscale else "RGB"
-            img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-
-            buf = io.BytesIO()
-            img.save(buf, format="JPEG", quality=quality, optimize=True)
-            img_bytes = buf.getvalue()
-            buf.close()
-
-            # Create new page with same physical size and place the JPEG
-            new_page = out.new_page(width=rect.width, height=rect.height)
-            new_page.insert_image(rect, stream=img_bytes)
-
-            # Progress
-            if progress_callback:
-                try:
-                    progress_callback(i, total_pages)
-                except Exception:
-                    pass
-            print(f"Processed page {i}/{total_pages}", file=sys.stderr)
+
+        # Render + encode is embarrassingly parallel (pages are independent),
+        # so fan the work out across cores. Results come back in page order;
+        # the output document is assembled here in the parent process.
+        tasks = [(input_path, i, dpi, quality, grayscale, jpeg_optimize) for i in range(total_pages)]
+        workers = max(1, min(os.cpu_count() or 1, total_pages))
+        # Spawn, not fork: the GUI calls this from a worker thread while the
+        # Tk main loop runs, and forking a multithreaded process is a
+        # deadlock hazard (and deprecated in newer CPython).
+        ctx = multiprocessing.get_context("spawn")
+        # Throttle stderr chatter: a synchronous write per page serializes on
+        # the terminal (or a GUI log pipe). Print ~50 updates max, and none
+        # at all when the caller gets progress through the callback.
+        log_step = max(1, total_pages // 50)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            for i, (width, height, img_bytes) in enumerate(pool.map(_render_page_jpeg, tasks), 1):
+                # Create new page with same physical size and place the JPEG
+                new_page = out.new_page(width=width, height=height)
+                new_page.insert_image(new_page.rect, stream=img_bytes)
+
+                # Progress
+                if progress_callback:
+                    try:
+                        progress_callback(i, total_pages)
+                    except Exception:
+                        pass
+                elif i % log_step == 0 or i == total_pages:
+                    print(f"Processed page {i}/{total_pages}", file=sys.stderr)
 
         save_kwargs = {
             "garbage": 4 if optimize else 1,
             "deflate": True,
+            # Pages are freshly-embedded JPEGs: never re-deflate them, and
+            # the remaining content streams are tiny, so moderate deflate
+            # effort (~level 6) loses nothing over the max-effort default.
+            "deflate_images": False,
+            "compression_effort": 60,
             "clean": clean,
             "expand": False,
         }
@@ -99,6 +209,7 @@ def main():
     ap.add_argument("--dpi", type=int, default=150, help="Render DPI (default: 150)")
     ap.add_argument("--quality", type=int, default=60, help="JPEG quality 1-100 (default: 60)")
     ap.add_argument("--grayscale", action="store_true", help="Convert pages to grayscale")
+    ap.add_argument("--jpeg-optimize", action="store_true", help="Extra Huffman-optimization pass per page (slower, ~1-3%% smaller)")
     ap.add_argument("--light", action="store_true", help="Preset: dpi=200, quality=75 (larger, better)")
     ap.add_argument("--medium", action="store_true", help="Preset: dpi=150, quality=60 (balanced)")
     ap.add_argument("--aggressive", action="store_true", help="Preset: dpi=120, quality=50 (smaller, lossy)")
@@ -125,6 +236,7 @@ def main():
         dpi=args.dpi,
         quality=args.quality,
         grayscale=args.grayscale,
+        jpeg_optimize=args.jpeg_optimize,
     )
     after = os.path.getsize(output)
     saved = before - after
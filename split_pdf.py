@@ -96,7 +96,12 @@ def split_pdf(
                 part.insert_pdf(src, from_page=a0, to_page=b0)
                 out_name = f"{base}_part{idx:02d}.pdf"
                 out_path = os.path.join(outdir, out_name)
-                part.save(out_path, garbage=3, clean=True, deflate=True)
+                # garbage=1 suffices here: a freshly-built doc holding one
+                # contiguous range has no duplicate objects to merge.
+                # Moderate deflate effort (~level 6): near-max ratio at about
+                # twice the speed; image streams are copied as-is anyway.
+                part.save(out_path, garbage=1, clean=True, deflate=True,
+                          deflate_images=False, compression_effort=60)
                 out_paths.append(out_path)
             finally:
                 part.close()
@@ -3,6 +3,7 @@ import os
 import sys
 import math
 import tempfile
+import numpy as np
 import pytest
 import fitz  # PyMuPDF
 from PIL import Image
@@ -38,11 +39,10 @@ def make_scanned_like_pdf(path: str, pages: int = 2, size=(2000, 2600)) -> str:
     doc = fitz.open()
     try:
         for i in range(pages):
-            img = Image.new("RGB", size, color=(230 - 30 * (i % 3), 230, 230))
-            # draw some lines to add detail
-            for y in range(0, size[1], 200):
-                for x in range(0, size[0], 200):
-                    img.putpixel((x, y), (10 * (i + 1), 100, 150))
+            arr = np.full((size[1], size[0], 3), (230 - 30 * (i % 3), 230, 230), dtype=np.uint8)
+            # mark a grid of points to add detail (vectorized strided store)
+            arr[::200, ::200] = (10 * (i + 1), 100, 150)
+            img = Image.fromarray(arr)
             buf = io.BytesIO()
             img.save(buf, format="PNG", optimize=True)
             data = buf.getvalue()
@@ -58,6 +58,25 @@ def make_scanned_like_pdf(path: str, pages: int = 2, size=(2000, 2600)) -> str:
     return path
 
 
+@pytest.fixture(scope="session")
+def scanned_pdf(tmp_path_factory):
+    """Factory for scanned-like source PDFs. They are expensive to build,
+    read-only in the tests, and identical across runs, so each (pages, size)
+    variant is generated once per session and reused.
+    """
+    base = tmp_path_factory.mktemp("scanned_srcs")
+    cache = {}
+
+    def _get(pages: int = 2, size=(2000, 2600)) -> str:
+        key = (pages, size)
+        if key not in cache:
+            path = base / f"scanned_{pages}p_{size[0]}x{size[1]}.pdf"
+            cache[key] = make_scanned_like_pdf(str(path), pages=pages, size=size)
+        return cache[key]
+
+    return _get
+
+
 # ---------- Tests: merge ----------
 
 def test_merge_basic(tmp_path):
@@ -128,9 +147,9 @@ def test_split_invalid_every_raises(tmp_path):
 
 # ---------- Tests: shrink scanned ----------
 
-def test_shrink_scanned_pdf_basic(tmp_path):
-    # Create an image-heavy source PDF which is typically large
-    src = make_scanned_like_pdf(tmp_path / "scanned_src.pdf", pages=2, size=(2200, 3000))
+def test_shrink_scanned_pdf_basic(scanned_pdf, tmp_path):
+    # Use an image-heavy source PDF which is typically large
+    src = scanned_pdf(pages=2, size=(2200, 3000))
     out = tmp_path / "scanned_out.pdf"
 
     compress_scanned_pdf(str(src), str(out), dpi=120, quality=50, grayscale=False)
@@ -153,8 +172,8 @@ def test_shrink_scanned_pdf_basic(tmp_path):
                 pix = None
 
 
-def test_shrink_grayscale_colorspace(tmp_path):
-    src = make_scanned_like_pdf(tmp_path / "scanned_src.pdf", pages=1, size=(1800, 2400))
+def test_shrink_grayscale_colorspace(scanned_pdf, tmp_path):
+    src = scanned_pdf(pages=1, size=(1800, 2400))
     out = tmp_path / "scanned_out_gray.pdf"
 
     compress_scanned_pdf(str(src), str(out), dpi=120, quality=55, grayscale=True)